@@ -0,0 +1,31 @@
+# fillers.py
+from typing import Any, Dict, List
+
+# Canned phrases the graph can say while a tool runs. They are fixed so their audio can be cached.
+DEFAULT_FILLER = "One moment while I check that."
+TOOL_FILLERS: Dict[str, str] = {
+    "mtg_search": "Let me look that up for you.",
+}
+
+
+def filler_phrases() -> List[str]:
+    """
+    Returns every canned filler the graph can emit, so the phrase cache can pre-synthesize them.
+    """
+    return [DEFAULT_FILLER, *TOOL_FILLERS.values()]
+
+
+def filler_for_tool_calls(tool_calls: List[Dict[str, Any]]) -> str:
+    """
+    Picks the filler to say while the given tool calls run.
+
+    Args:
+        tool_calls (List[Dict[str, Any]]): The tool calls of the AI message, as in AIMessage.tool_calls.
+
+    Returns:
+        str: The filler of the tool when every call goes to the same tool, DEFAULT_FILLER otherwise.
+    """
+    names = {tool_call.get("name") for tool_call in tool_calls}
+    if len(names) == 1:
+        return TOOL_FILLERS.get(names.pop(), DEFAULT_FILLER)
+    return DEFAULT_FILLER
@@ -1,15 +1,48 @@
 from __future__ import annotations
-from time import time
-from typing import Any, Dict
+import weakref
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Dict, Optional, Set
 from livekit.agents import llm
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage
 from langgraph.graph.state import CompiledGraph
 from livekit.agents.llm.llm import APIConnectOptions
 from livekit.agents.llm.chat_context import ChatMessage
+from _langgraph.nodes.tool_progress import PROGRESS_EVENT
 import logging
 
 logger = logging.getLogger(__name__)
 
+@dataclass
+class GraphRunStats:
+    """
+    Live counters of the work a LivekitGraphRunner is carrying, used for load reporting.
+
+    Attributes:
+        active_streams (int): Graph runs currently being streamed.
+        pending_tool_calls (int): Tool calls requested by the LLM whose result hasn't come back yet.
+    """
+    active_streams: int = 0
+    pending_tool_calls: int = 0
+
+@dataclass
+class TurnTiming:
+    """
+    Timings of a graph run, in seconds since its stream was created.
+
+    Attributes:
+        started (float): perf_counter() value when the stream was created.
+        first_chunk (Optional[float]): When the first text was sent to the TTS, filler or not.
+        first_progress (Optional[float]): When the first progress filler was sent.
+        first_answer (Optional[float]): When the first text of the LLM answer after the tools was sent.
+        tool_calls (int): Tool calls requested during the run.
+    """
+    started: float
+    first_chunk: Optional[float] = None
+    first_progress: Optional[float] = None
+    first_answer: Optional[float] = None
+    tool_calls: int = 0
+
 # LiveKit wrapper for a LangGraph-compiled graph.
 class LivekitGraphRunner(llm.LLM):
     """
@@ -25,6 +58,10 @@ class LivekitGraphRunner(llm.LLM):
         super().__init__()  # Initializes base attributes (e.g., _events)
         self.graph = graph
         self.initial_state = initial_state or {}
+        self.stats = GraphRunStats()
+        self.last_turn: Optional[TurnTiming] = None
+        # Set by the load reporter when the worker is saturated, nodes should skip optional work (speculation, summarization).
+        self.shed_optional_work = False
 
     def chat(
         self, *, chat_ctx: llm.ChatContext, **kwargs: Any
@@ -69,19 +106,94 @@ class GraphStream(llm.LLMStream):
         # Convert to base messages.
         base_messages = [chat_message_to_base_message(m) for m in chat_ctx.messages]
         # Extract messages from the chat context.
-        config = {"configurable": {"thread_id": "1"}}
+        config = {"configurable": {"thread_id": "1", "shed_optional_work": llm.shed_optional_work}}
 
         # Add messages to initial state.
         initial_state["messages"] = base_messages
 
-        self._stream = graph.astream(initial_state, config=config, stream_mode="messages") # Stream mode is "messages" for now, if changed to "updates" the interface of __anext__ should change. 
-        # Instead of update[0].content, it should be update["node_name"]["messages"][-1]["content"] or something like that, I can't remember exactly, but just print a chunk to see the structure.
+        # Track this run in the runner counters until the stream is exhausted or closed.
+        self._stats = llm.stats
+        self._stats.active_streams += 1
+        self._pending_tool_call_ids: Set[str] = set()
+        # Safety net: a stream dropped without being exhausted or closed still leaves the counters when collected.
+        self._release_stats = weakref.finalize(self, _release_stats, self._stats, self._pending_tool_call_ids)
+        self._tools_returned = False
+        self._timing = TurnTiming(started=perf_counter())
+        llm.last_turn = self._timing
+
+        # "messages" streams the LLM tokens, "custom" streams the progress fillers written by the graph nodes.
+        # Chunks come as (mode, chunk) tuples, if the modes change the interface of __anext__ should change too.
+        self._stream = graph.astream(initial_state, config=config, stream_mode=["messages", "custom"])
 
     async def _run(self) -> None:
         """
         We need this here so that the abstract method is fulfilled. This method is not used. The inference is done in __anext__ instead but we need this method to fulfill the abstract method.
         """
 
+    async def aclose(self) -> None:
+        """
+        Closes the stream and releases it from the runner counters.
+        The graph run is closed first, so an interrupted turn doesn't keep running (and calling tools) in the background.
+        """
+        await self._stream.aclose()
+        self._release()
+        await super().aclose()
+
+    def _track_tool_calls(self, message: BaseMessage) -> None:
+        """
+        Updates the pending tool call counter from a streamed message.
+        Tool calls are pending from the moment the LLM requests them until their ToolMessage comes back.
+        """
+        if isinstance(message, ToolMessage):
+            self._tools_returned = True
+            if message.tool_call_id in self._pending_tool_call_ids:
+                self._pending_tool_call_ids.discard(message.tool_call_id)
+                self._stats.pending_tool_calls -= 1
+            return
+        tool_calls = list(getattr(message, "tool_call_chunks", None) or []) + list(getattr(message, "tool_calls", None) or [])
+        for tool_call in tool_calls:
+            tool_call_id = tool_call.get("id")
+            if tool_call_id and tool_call_id not in self._pending_tool_call_ids:
+                self._pending_tool_call_ids.add(tool_call_id)
+                self._stats.pending_tool_calls += 1
+                self._timing.tool_calls += 1
+
+    def _release(self) -> None:
+        """
+        Removes this run from the runner counters, only once.
+        """
+        if not self._release_stats.alive:
+            return
+        self._release_stats()
+        timing = self._timing
+        if timing.tool_calls:
+            logger.info(
+                f"tool turn: first chunk {_format_seconds(timing.first_chunk)}, "
+                f"first progress {_format_seconds(timing.first_progress)}, "
+                f"first answer {_format_seconds(timing.first_answer)}"
+            )
+
+    def _chat_chunk(self, content: str, index: int, progress: bool = False) -> llm.ChatChunk:
+        """
+        Wraps text in a ChatChunk and records when it was sent.
+        """
+        elapsed = perf_counter() - self._timing.started
+        if self._timing.first_chunk is None:
+            self._timing.first_chunk = elapsed
+        if progress and self._timing.first_progress is None:
+            self._timing.first_progress = elapsed
+        if not progress and self._tools_returned and self._timing.first_answer is None:
+            self._timing.first_answer = elapsed
+        return llm.ChatChunk(
+            request_id=index,
+            choices=[
+                llm.Choice(
+                    delta=llm.ChoiceDelta(content=content, role="assistant"),
+                    index=index,
+                )
+            ]
+        )
+
     async def __anext__(self) -> llm.ChatChunk | None:
         """
         Processes the chat context and returns the next ChatChunk.
@@ -94,7 +206,9 @@ class GraphStream(llm.LLMStream):
 
         This method is an async generator that processes the chat context and yields the next ChatChunk.
         It does so by iterating over the stream and returning the last message as a Choice in a ChatChunk.
-        Implementation should change if the stream method changes. Right now we are using "messages".
+        Implementation should change if the stream method changes. Right now we are using "messages" and "custom".
+        Progress fillers written by the graph ("custom" events of type "progress") are returned as regular ChatChunks,
+        so the user hears them while the tools run.
 
         This is where the magic hapens, the __anext__ method is the one that LiveKit expects to stream the messages to the client.
         And in order to do so it expects an output of type llm.ChatChunk, which is a class that contains a list of llm.Choice objects.
@@ -102,23 +216,38 @@ class GraphStream(llm.LLMStream):
         that we then need to convert to the llm.ChatChunk format. This way we can use langgraph to do the inference as if it was a LiveKit LLM.
         """
         index = 0
-        async for chunk in self._stream:
+        async for mode, chunk in self._stream:
+            if mode == "custom":
+                if isinstance(chunk, dict) and chunk.get("type") == PROGRESS_EVENT and chunk.get("content"):
+                    index += 1
+                    # The trailing space keeps the filler apart from the answer that follows it.
+                    return self._chat_chunk(chunk["content"] + " ", index, progress=True)
+                continue
+            self._track_tool_calls(chunk[0])
             if isinstance(chunk[0], ToolMessage):
                 continue
             index += 1
             if chunk[0].content:
                 # Retrieve the last message.
-                return llm.ChatChunk(
-                    request_id=index,
-                    choices=[
-                        llm.Choice(
-                            delta=llm.ChoiceDelta(content=chunk[0].content, role="assistant"),
-                            index=index,
-                        )
-                    ]
-                )
+                return self._chat_chunk(chunk[0].content, index)
+        self._release()
         raise StopAsyncIteration
 
+def _release_stats(stats: GraphRunStats, pending_tool_call_ids: Set[str]) -> None:
+    """
+    Removes a graph run and its pending tool calls from the runner counters.
+    It's the finalizer of GraphStream, so it must not reference the stream itself.
+    """
+    stats.active_streams -= 1
+    stats.pending_tool_calls -= len(pending_tool_call_ids)
+    pending_tool_call_ids.clear()
+
+def _format_seconds(value: Optional[float]) -> str:
+    """
+    Formats an optional duration for the logs.
+    """
+    return "n/a" if value is None else f"{value:.3f}s"
+
 def chat_message_to_base_message(chat_msg: ChatMessage) -> BaseMessage:
     """
     Convert a LiveKit ChatMessage into a LangChain BaseMessage.
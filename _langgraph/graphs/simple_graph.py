@@ -1,8 +1,8 @@
 # simple_graph.py
+from typing import Any
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.state import CompiledStateGraph
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import BaseMessage
 from _langgraph.graph_factory import LangGraphFactory
 
@@ -13,6 +13,16 @@ class State(TypedDict):
     """
     messages: list[BaseMessage]
 
+def preload() -> Any:
+    """
+    Imports the heavy dependencies of the graph, called from prewarm and by the graph builder.
+
+    Returns:
+        The ChatOpenAI class.
+    """
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI
+
 def build_simple_graph(graph: StateGraph) -> None:
     """
     Build a simple graph that chains a prompt with an LLM model.
@@ -24,6 +34,9 @@ def build_simple_graph(graph: StateGraph) -> None:
         None
     """
 
+    # Imported here so that importing the graph module doesn't load the OpenAI client, prewarm has already loaded it.
+    ChatOpenAI = preload()
+
     # Configure a real LLM instance.
     llm = ChatOpenAI(temperature=0.7, model="gpt-4o-mini", streaming=True)
 
@@ -3,11 +3,8 @@ from langgraph.graph import StateGraph, START, END
 from _langgraph.graph_factory import LangGraphFactory
 from _langgraph.base_state import BaseState, NodeMetadata
 from _langgraph.nodes.llm_node import LLMNode  # Our custom LLM node
-from _langgraph.tools.mtg_tool import mtg_search     # Our MTG search tool (decorated with @tool)
-from _langgraph.base_state import BaseState
-from langgraph.prebuilt import ToolNode
-from langchain_openai import ChatOpenAI
-from typing import Tuple
+from _langgraph.nodes.tool_progress import tool_progress_node  # Says a filler while the tools run
+from typing import Any, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,10 +13,26 @@ logger = logging.getLogger(__name__)
 def route_tools(state: BaseState) -> str:
     last_message = state.messages[-1]
     if last_message.tool_calls:
-        return "tool_node"
+        return "tool_progress_node"
     return END
 
+def preload() -> Tuple[Any, Any, Any]:
+    """
+    Imports the heavy dependencies of the graph. Called from prewarm, so idle job processes pay for them
+    before a job is assigned. The worker process never imports this module.
+
+    Returns:
+        The ChatOpenAI and ToolNode classes and the mtg_search tool, used by build_tool_graph().
+    """
+    from langchain_openai import ChatOpenAI
+    from langgraph.prebuilt import ToolNode
+    from _langgraph.tools.mtg_tool import mtg_search     # Our MTG search tool (decorated with @tool)
+    return ChatOpenAI, ToolNode, mtg_search
+
 async def build_tool_graph(graph: StateGraph) -> None:
+    # Heavy dependencies are imported by preload() rather than at module level, prewarm has already loaded them.
+    ChatOpenAI, ToolNode, mtg_search = preload()
+
     # Add nodes to the graph.
     
     # Instantiate the LLM node, passing in the model and the list of tools.
@@ -32,6 +45,9 @@ async def build_tool_graph(graph: StateGraph) -> None:
         tools=[mtg_search]
     )
     graph.add_node("llm_node", llm_node.run)
+
+    # Streams a filler to the user as soon as the LLM asks for tools, before they run.
+    graph.add_node("tool_progress_node", tool_progress_node)
     
     # Instantiate the built-in ToolNode with our mtg_search tool.
     tool_node_instance = ToolNode(tools=[mtg_search])
@@ -39,7 +55,8 @@ async def build_tool_graph(graph: StateGraph) -> None:
     
     # Build the graph edges:
     graph.add_edge(START, "llm_node")
-    graph.add_conditional_edges("llm_node", route_tools, ["tool_node", END])
+    graph.add_conditional_edges("llm_node", route_tools, ["tool_progress_node", END])
+    graph.add_edge("tool_progress_node", "tool_node")
     graph.add_edge("tool_node", "llm_node")
 
 # Create a factory for our BaseState.
@@ -56,6 +73,7 @@ async def get_compiled_graph() -> Tuple[BaseState, StateGraph]:
     initial_state = {
         "node_registry": {
             "llm_node": {"name": "llm_node", "description": "Generates LLM responses with bound tools."},
+            "tool_progress_node": {"name": "tool_progress_node", "description": "Tells the user the agent is working while tools run."},
             "tool_node": {"name": "tool_node", "description": "Executes MTG search tool calls."}
         },
         "context": {}
@@ -1,6 +1,6 @@
 from typing import Callable, Dict, Any, List, Optional, Union
 from langchain_core.messages import SystemMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.language_models import BaseChatModel
 from langchain_core.tools import BaseTool
 from langchain_core.runnables import Runnable
 from _langgraph.nodes.base_node import BaseNode
@@ -14,7 +14,7 @@ class LLMNode(BaseNode):
     An LLM node that processes conversation messages and generates a response using an LLM.
     The node now receives a model and a list of tools so that it can bind the tools to the model.
     """
-    model: ChatOpenAI
+    model: BaseChatModel
     tools: Optional[List[Callable[[Union[Callable, Runnable]], BaseTool]]] = None
 
     async def run(self, state: BaseState) -> Dict[str, Any]:
@@ -32,12 +32,3 @@ class LLMNode(BaseNode):
         result = await model.ainvoke(messages)
         
         return {"messages": [result]}
-
-# When instantiating the node, pass in the model and the list of tools.
-llm_node = LLMNode(
-    name="llm_node",
-    description="Generates responses using an LLM based on conversation history.",
-    func=LLMNode.run,  # assign the run method as the node's functionality.
-    model=ChatOpenAI(temperature=0.7, model="gpt-4o-mini", streaming=True),
-    tools=[]  # populate this list with your tools, e.g., [mtg_search]
-)
\ No newline at end of file
@@ -1,5 +1,4 @@
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 from typing import Any
 from _langgraph.base_state import BaseState
 
@@ -44,6 +43,7 @@ async def supervisor_node(state: BaseState) -> BaseState:
     """.strip()
     
     # Create a ChatOpenAI instance (adjust model parameters as needed)
+    from langchain_openai import ChatOpenAI
     model = ChatOpenAI(temperature=0, model="gpt-4o-mini", streaming=False)
     
     # Call the model asynchronously to get a decision.
@@ -0,0 +1,39 @@
+from typing import Any, Dict
+from langgraph.types import StreamWriter
+from _langgraph.base_state import BaseState
+from _langgraph.fillers import filler_for_tool_calls
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Type of the custom stream events carrying progress text for the user.
+PROGRESS_EVENT = "progress"
+
+async def tool_progress_node(state: BaseState, writer: StreamWriter) -> Dict[str, Any]:
+    """
+    A node that runs right before the tool node and tells the user the agent is working on it,
+    so there is no dead air while the tools run.
+
+    The filler is streamed right away through the "custom" stream mode, and it's also written as the content
+    of the AI message that requested the tools, so the checkpointed history reads the same as what was said.
+    The message keeps its id, so add_messages replaces it in place and it stays right before its ToolMessages.
+
+    Args:
+        state (BaseState): The current state, its last message holds the tool calls.
+        writer (StreamWriter): The LangGraph stream writer, injected by LangGraph.
+
+    Returns:
+        Dict[str, Any]: The state update.
+    """
+    last_message = state.messages[-1]
+    # If the LLM already said something before calling the tools, it has been streamed, no filler needed.
+    if last_message.content or not last_message.tool_calls:
+        return {}
+
+    filler = filler_for_tool_calls(last_message.tool_calls)
+    writer({
+        "type": PROGRESS_EVENT,
+        "content": filler,
+        "tool_calls": [tool_call["name"] for tool_call in last_message.tool_calls],
+    })
+    return {"messages": [last_message.model_copy(update={"content": filler})]}
@@ -0,0 +1,340 @@
+# load.py
+from __future__ import annotations
+import asyncio
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+import weakref
+from dataclasses import asdict, dataclass, field, fields
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from livekit.agents import JobRequest, Worker, WorkerOptions
+from livekit.agents.worker import _WorkerEnvOption
+import logging
+
+if TYPE_CHECKING:
+    from _langgraph.graph_wrapper import LivekitGraphRunner
+
+logger = logging.getLogger(__name__)
+
+# Job processes and the worker process share load snapshots through this directory.
+LOAD_DIR_ENV = "GRAPH_WORKER_LOAD_DIR"
+# Prefix of the environment variables that override the WorkerLoad limits.
+LIMITS_ENV_PREFIX = "WORKER_LOAD_"
+# File where the worker process publishes its load for the job processes.
+WORKER_LOAD_FILE = "worker.load"
+
+# LiveKit's default load function: a moving average of the worker CPU usage, between 0 and 1.
+_default_load_fnc = WorkerOptions.load_fnc
+
+
+def default_load_dir() -> str:
+    """
+    Returns the directory where job processes publish their load snapshots.
+    The worker sets LOAD_DIR_ENV on startup so that its job processes inherit it.
+    """
+    return os.environ.get(LOAD_DIR_ENV) or os.path.join(tempfile.gettempdir(), "livekit-graph-load", str(os.getpid()))
+
+
+@dataclass
+class LoadSnapshot:
+    """
+    The load of a single job process at a point in time.
+    """
+    pid: int
+    active_streams: int
+    pending_tool_calls: int
+    loop_lag: float
+    timestamp: float
+
+
+@dataclass
+class WorkerLoad:
+    """
+    Computes the worker load from the snapshots published by its job processes and
+    provides the load_fnc and request_fnc used by WorkerOptions.
+
+    The load is the highest of the ratios between each counter and its limit, so whichever resource
+    saturates first (CPU, jobs, graph streams, tool calls or event-loop lag) drives it.
+    The CPU load is LiveKit's default load, so this adds to it rather than replacing it.
+
+    The limits can be set with WORKER_LOAD_<FIELD> environment variables (e.g. WORKER_LOAD_MAX_JOBS=4),
+    see from_env(). Job processes inherit them, so both sides use the same limits.
+
+    Like LiveKit's default, load_threshold only applies in production: in dev mode the worker is never
+    marked full and request_fnc accepts every job. The load is still computed and published.
+
+    Args:
+        max_jobs (int): Jobs a worker can carry.
+        max_active_streams (int): Graph runs that can be streamed at the same time.
+        max_pending_tool_calls (int): Tool calls that can be waiting for a result at the same time.
+        max_loop_lag (float): Event-loop lag, in seconds, at which a job process is considered saturated.
+        load_threshold (float): Load at which the worker stops accepting jobs.
+        shed_threshold (float): Load at which optional work is shed. Lower than load_threshold so it happens first.
+        stale_after (float): Seconds after which a snapshot is ignored, e.g. because its process died.
+        accept_grace (float): Seconds an accepted job is counted before it shows up in the worker active jobs.
+        directory (str): Where snapshots are published.
+    """
+    max_jobs: int = 8
+    max_active_streams: int = 8
+    max_pending_tool_calls: int = 16
+    max_loop_lag: float = 0.2
+    load_threshold: float = 0.75
+    shed_threshold: float = 0.6
+    stale_after: float = 5.0
+    accept_grace: float = 10.0
+    directory: str = field(default_factory=default_load_dir)
+    # Runtime state of the worker process, not part of the configuration.
+    _worker: Optional[Worker] = field(default=None, init=False, repr=False, compare=False)
+    _cpu_load: float = field(default=0.0, init=False, repr=False, compare=False)
+    _devmode: bool = field(default=False, init=False, repr=False, compare=False)
+    _accepted: Dict[str, float] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_env(cls) -> WorkerLoad:
+        """
+        Creates a WorkerLoad with the limits set in WORKER_LOAD_<FIELD> environment variables.
+        """
+        overrides = {}
+        for f in fields(cls):
+            if not f.init or f.name == "directory":
+                continue
+            value = os.environ.get(f"{LIMITS_ENV_PREFIX}{f.name.upper()}")
+            if value is not None:
+                overrides[f.name] = type(getattr(cls, f.name))(value)
+        return cls(**overrides)
+
+    def threshold_option(self) -> _WorkerEnvOption[float]:
+        """
+        Returns the load_threshold for WorkerOptions, keeping LiveKit's dev default of never marking the worker full.
+        """
+        return _WorkerEnvOption(dev_default=math.inf, prod_default=self.load_threshold)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # WorkerOptions must be pickle-able, the worker and the lock are not.
+        state = self.__dict__.copy()
+        state.update(_worker=None, _accepted={}, _lock=None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state, _lock=threading.Lock())
+
+    def read_snapshots(self) -> List[LoadSnapshot]:
+        """
+        Reads the snapshots of every live job process. Stale snapshots are removed.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        now = time.time()
+        snapshots = []
+        for file_name in os.listdir(self.directory):
+            if not file_name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, file_name)
+            try:
+                with open(path) as f:
+                    snapshot = LoadSnapshot(**json.load(f))
+            except (OSError, ValueError, TypeError):
+                continue  # being written or removed by its job process
+            if now - snapshot.timestamp > self.stale_after:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            snapshots.append(snapshot)
+        return snapshots
+
+    def compute_load(self, snapshots: List[LoadSnapshot], job_count: Optional[int] = None, cpu_load: float = 0.0) -> float:
+        """
+        Computes the load between 0 and 1 from job process snapshots.
+
+        Args:
+            snapshots (List[LoadSnapshot]): The snapshots of the job processes.
+            job_count (Optional[int]): Jobs the worker is running, defaults to the number of snapshots.
+            cpu_load (float): The CPU load of the worker, between 0 and 1.
+
+        Returns:
+            float: The worker load.
+        """
+        job_count = max(job_count or 0, len(snapshots))
+        ratios = [cpu_load, job_count / self.max_jobs]
+        if snapshots:
+            ratios.append(sum(s.active_streams for s in snapshots) / self.max_active_streams)
+            ratios.append(sum(s.pending_tool_calls for s in snapshots) / self.max_pending_tool_calls)
+            ratios.append(max(s.loop_lag for s in snapshots) / self.max_loop_lag)
+        return min(1.0, max(ratios))
+
+    def current_load(self) -> float:
+        """
+        Reads the snapshots and computes the current load. In the worker process it also counts the
+        jobs that haven't published a snapshot yet and the CPU load measured by the last load_fnc call.
+        """
+        return self.compute_load(self.read_snapshots(), self._job_count(), self._cpu_load)
+
+    def _job_count(self) -> int:
+        """
+        Counts the running jobs plus the accepted jobs that aren't running yet.
+        """
+        running = {job.job.id for job in self._worker.active_jobs} if self._worker is not None else set()
+        now = time.time()
+        with self._lock:
+            self._accepted = {
+                job_id: accepted_at
+                for job_id, accepted_at in self._accepted.items()
+                if job_id not in running and now - accepted_at < self.accept_grace
+            }
+            return len(running) + len(self._accepted)
+
+    def load_fnc(self, worker: Worker) -> float:
+        """
+        Load function for WorkerOptions. LiveKit marks the worker as full once it reaches load_threshold.
+        The load is also published so job processes can shed optional work based on the whole worker load.
+        """
+        self._worker = worker
+        self._devmode = worker._devmode  # not exposed publicly, set by the CLI for dev and console
+        self._cpu_load = _default_load_fnc(worker)
+        load = self.current_load()
+        try:
+            self._publish_worker_load(load)
+        except OSError as e:
+            logger.warning(f"could not publish worker load: {e}")
+        return load
+
+    def read_worker_load(self) -> Optional[float]:
+        """
+        Returns the load last published by the worker process, or None if it's missing or stale.
+        """
+        try:
+            with open(os.path.join(self.directory, WORKER_LOAD_FILE)) as f:
+                published = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - published["timestamp"] > self.stale_after:
+            return None
+        return published["load"]
+
+    def _publish_worker_load(self, load: float) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, WORKER_LOAD_FILE)
+        tmp_path = path + ".tmp"  # only the worker process writes this file
+        with open(tmp_path, "w") as f:
+            json.dump({"load": load, "timestamp": time.time()}, f)
+        os.replace(tmp_path, path)
+
+    async def request_fnc(self, req: JobRequest) -> None:
+        """
+        Request function for WorkerOptions. Rejects jobs while the worker is saturated, since the
+        reported load is only refreshed every few seconds and jobs can still be dispatched in between.
+        Accepted jobs are counted right away, before their process starts reporting.
+        """
+        load = await asyncio.to_thread(self.current_load)
+        if load >= self.load_threshold and not self._devmode:
+            logger.warning(f"rejecting job {req.id}, worker load {load:.2f} is above {self.load_threshold}")
+            await req.reject()
+            return
+        with self._lock:
+            self._accepted[req.id] = time.time()
+        await req.accept()
+
+
+class JobLoadReporter:
+    """
+    Runs inside a job process: measures event-loop lag, publishes the counters of the tracked
+    LivekitGraphRunner instances for the worker, and tells the runners to shed optional work
+    when the worker load goes above the shed threshold.
+
+    Args:
+        worker_load (WorkerLoad): The limits and the snapshot directory shared with the worker.
+        interval (float): Seconds between two snapshots.
+    """
+    def __init__(self, worker_load: WorkerLoad, interval: float = 0.5) -> None:
+        """
+        Initializes the reporter.
+        """
+        self.worker_load = worker_load
+        self.interval = interval
+        self.loop_lag = 0.0
+        self.load = 0.0
+        self._runners: weakref.WeakSet[LivekitGraphRunner] = weakref.WeakSet()
+        self._path = os.path.join(worker_load.directory, f"{os.getpid()}.json")
+        self._task: Optional[asyncio.Task] = None
+
+    def track(self, runner: LivekitGraphRunner) -> None:
+        """
+        Adds a runner whose counters are reported.
+        """
+        self._runners.add(runner)
+
+    def snapshot(self) -> LoadSnapshot:
+        """
+        Returns the current load of this job process.
+        """
+        runners = list(self._runners)
+        return LoadSnapshot(
+            pid=os.getpid(),
+            active_streams=sum(r.stats.active_streams for r in runners),
+            pending_tool_calls=sum(r.stats.pending_tool_calls for r in runners),
+            loop_lag=self.loop_lag,
+            timestamp=time.time(),
+        )
+
+    def start(self) -> None:
+        """
+        Starts reporting in the background.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="JobLoadReporter._run")
+
+    async def aclose(self) -> None:
+        """
+        Stops reporting and removes this process snapshot.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            os.remove(self._path)
+        except OSError:
+            pass
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            # Anything above the requested sleep is time the loop spent busy with other callbacks.
+            lag = max(0.0, loop.time() - started - self.interval)
+            # Keep a decaying peak so a single slow tick is still visible to the worker.
+            self.loop_lag = max(lag, self.loop_lag * 0.8)
+            try:
+                self.load = await asyncio.to_thread(self._publish, self.snapshot())
+            except OSError as e:
+                logger.warning(f"could not publish job load: {e}")
+                continue
+            shed = self.load >= self.worker_load.shed_threshold
+            for runner in self._runners:
+                if runner.shed_optional_work != shed:
+                    logger.info(f"{'shedding' if shed else 'resuming'} optional work, worker load {self.load:.2f}")
+                runner.shed_optional_work = shed
+
+    def _publish(self, snapshot: LoadSnapshot) -> float:
+        """
+        Writes this process snapshot and returns the load of the whole worker.
+        """
+        os.makedirs(self.worker_load.directory, exist_ok=True)
+        tmp_path = self._path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(asdict(snapshot), f)
+        os.replace(tmp_path, self._path)
+        # The worker load includes the CPU load but is only refreshed every few seconds,
+        # the snapshots of the job processes are fresher.
+        worker_load = self.worker_load.read_worker_load() or 0.0
+        return max(worker_load, self.worker_load.current_load())
@@ -0,0 +1,60 @@
+# local_tts.py
+from __future__ import annotations
+import asyncio
+import math
+import struct
+from livekit import rtc
+from livekit.agents import tts, utils
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS, APIConnectOptions
+
+
+class LocalTTS(tts.TTS):
+    """
+    A stand-in TTS that generates a quiet tone locally instead of calling a provider.
+    Useful to exercise the voice pipeline and the phrase cache without API keys or network.
+
+    Args:
+        sample_rate (int): The sample rate of the generated audio.
+        latency (float): Seconds to wait before the first frame, to mimic a provider round-trip.
+        seconds_per_char (float): How much audio is generated for each character of text.
+    """
+    def __init__(self, *, sample_rate: int = 24000, latency: float = 0.3, seconds_per_char: float = 0.06) -> None:
+        """
+        Initializes the stand-in TTS.
+        """
+        super().__init__(
+            capabilities=tts.TTSCapabilities(streaming=False),
+            sample_rate=sample_rate,
+            num_channels=1,
+        )
+        self.latency = latency
+        self.seconds_per_char = seconds_per_char
+
+    def synthesize(self, text: str, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS) -> LocalChunkedStream:
+        return LocalChunkedStream(tts=self, input_text=text, conn_options=conn_options)
+
+
+class LocalChunkedStream(tts.ChunkedStream):
+    """
+    Generates a 440Hz tone as long as the text would take to say.
+    """
+    def __init__(self, *, tts: LocalTTS, input_text: str, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS) -> None:
+        super().__init__(tts=tts, input_text=input_text, conn_options=conn_options)
+        self._local_tts = tts
+
+    async def _run(self) -> None:
+        await asyncio.sleep(self._local_tts.latency)
+        request_id = utils.shortuuid()
+        sample_rate = self._local_tts.sample_rate
+        samples_per_frame = sample_rate // 50  # 20ms frames
+        total_samples = int(len(self._input_text) * self._local_tts.seconds_per_char * sample_rate)
+        for start in range(0, total_samples, samples_per_frame):
+            count = min(samples_per_frame, total_samples - start)
+            samples = (int(1000 * math.sin(2 * math.pi * 440 * (start + i) / sample_rate)) for i in range(count))
+            frame = rtc.AudioFrame(
+                data=struct.pack(f"<{count}h", *samples),
+                sample_rate=sample_rate,
+                num_channels=1,
+                samples_per_channel=count,
+            )
+            self._event_ch.send_nowait(tts.SynthesizedAudio(frame=frame, request_id=request_id))
@@ -0,0 +1,400 @@
+# phrase_cache.py
+from __future__ import annotations
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+import wave
+from typing import Any, Dict, Iterable, List, Optional
+from livekit import rtc
+from livekit.agents import tts, utils
+from livekit.agents.metrics import TTSMetrics
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS, APIConnectOptions
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Length of the frames the cached audio is split into when it is played back.
+FRAME_DURATION_MS = 20
+
+
+def normalize_phrase(text: str) -> str:
+    """
+    Normalizes a phrase so that whitespace differences don't produce cache misses.
+
+    Args:
+        text (str): The phrase to normalize.
+
+    Returns:
+        str: The phrase with collapsed whitespace.
+    """
+    return " ".join(text.split())
+
+
+def tts_namespace(tts: tts.TTS, **options: Any) -> str:
+    """
+    Builds the namespace of a TTS for the phrase cache, from its label and the options it was created with.
+    Every option that changes the audio (voice, model, language, speed...) must be passed, otherwise
+    changing it would replay the audio cached for the previous value.
+
+    Args:
+        tts (tts.TTS): The TTS that synthesizes the phrases.
+        **options: The options the TTS was created with.
+
+    Returns:
+        str: The namespace.
+    """
+    parts = [tts.label] + [f"{name}={options[name]!r}" for name in sorted(options)]
+    return "|".join(parts)
+
+
+class PhraseAudioCache:
+    """
+    An in-memory and on-disk cache of synthesized audio for fixed phrases.
+
+    Audio is stored as one WAV file per phrase inside cache_dir, named after the phrase key,
+    so it survives worker restarts. The in-memory copy is what gets played back.
+
+    Args:
+        cache_dir (str): The directory where the WAV files are stored.
+    """
+    def __init__(self, cache_dir: str = ".cache/phrases") -> None:
+        """
+        Initializes the cache.
+        """
+        self.cache_dir = cache_dir
+        self._frames: Dict[str, List[rtc.AudioFrame]] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._frames
+
+    def get(self, key: str) -> Optional[List[rtc.AudioFrame]]:
+        """
+        Returns the cached frames for a key, if they are in memory.
+        """
+        return self._frames.get(key)
+
+    def put(self, key: str, frames: List[rtc.AudioFrame]) -> None:
+        """
+        Stores frames in memory and writes them to disk.
+        """
+        if not frames:
+            return
+        self._frames[key] = frames
+        self._write(key, frames)
+
+    def load(self, key: str) -> Optional[List[rtc.AudioFrame]]:
+        """
+        Loads the frames for a key from disk into memory.
+
+        Returns:
+            Optional[List[rtc.AudioFrame]]: The frames, or None if they are not on disk.
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            frames = _read_wav(path)
+        except (OSError, wave.Error, EOFError) as e:
+            logger.warning(f"ignoring unreadable phrase cache file {path}: {e}")
+            return None
+        if not frames:
+            return None
+        self._frames[key] = frames
+        return frames
+
+    def load_all(self) -> int:
+        """
+        Loads every cached phrase found on disk into memory. Meant to be called from prewarm.
+
+        Returns:
+            int: The number of phrases loaded.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        loaded = 0
+        for file_name in os.listdir(self.cache_dir):
+            key, ext = os.path.splitext(file_name)
+            if ext == ".wav" and key not in self._frames and self.load(key) is not None:
+                loaded += 1
+        return loaded
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    def _write(self, key: str, frames: List[rtc.AudioFrame]) -> None:
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temporary file first so a crashed worker never leaves a truncated WAV behind.
+            # The name is unique so job processes warming the same phrase don't write to the same file.
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                _write_wav(f, frames)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"could not persist phrase audio {key}: {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+class CachedTTS(tts.TTS):
+    """
+    A TTS wrapper that plays cached audio for known phrases and delegates everything else.
+
+    synthesize() (used by agent.say with a string) returns the cached frames directly.
+    stream() (used for LLM replies) plays cached audio for canned phrases at the start of a reply,
+    e.g. fillers emitted by the graph, and forwards the rest of the text to the wrapped TTS.
+
+    Args:
+        tts (tts.TTS): The TTS used to synthesize phrases that aren't cached.
+        cache (PhraseAudioCache): The cache where phrase audio is kept.
+        namespace (str): Identifies the voice, so that changing the TTS or voice doesn't replay stale audio.
+            See tts_namespace().
+    """
+    def __init__(self, *, tts: tts.TTS, cache: PhraseAudioCache, namespace: str) -> None:
+        """
+        Initializes the cached TTS.
+        """
+        super().__init__(
+            capabilities=tts.capabilities,
+            sample_rate=tts.sample_rate,
+            num_channels=tts.num_channels,
+        )
+        self._wrapped = tts
+        self._cache = cache
+        self._namespace = namespace
+        self._phrases: Dict[str, str] = {}  # normalized phrase -> cache key
+
+        @self._wrapped.on("metrics_collected")
+        def _forward_metrics(*args, **kwargs):
+            self.emit("metrics_collected", *args, **kwargs)
+
+    def key_for(self, text: str) -> str:
+        """
+        Computes the cache key for a phrase spoken by the wrapped TTS.
+        """
+        raw = f"{self._namespace}|{self.sample_rate}|{self.num_channels}|{normalize_phrase(text)}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def cached_frames(self, text: str) -> Optional[List[rtc.AudioFrame]]:
+        """
+        Returns the cached frames for a phrase, or None if it hasn't been warmed.
+        """
+        key = self._phrases.get(normalize_phrase(text))
+        if key is None:
+            return None
+        return self._cache.get(key)
+
+    def is_phrase_prefix(self, text: str) -> bool:
+        """
+        Whether text could still grow into one of the cached phrases.
+        """
+        text = normalize_phrase(text)
+        return any(phrase.startswith(text) for phrase in self._phrases)
+
+    async def warm(self, phrases: Iterable[str]) -> None:
+        """
+        Makes sure every phrase is cached, loading it from disk or synthesizing it once.
+
+        Args:
+            phrases (Iterable[str]): The fixed phrases to cache.
+        """
+        for phrase in phrases:
+            phrase = normalize_phrase(phrase)
+            if not phrase:
+                continue
+            key = self.key_for(phrase)
+            if key not in self._cache and await asyncio.to_thread(self._cache.load, key) is None:
+                try:
+                    async with self._wrapped.synthesize(phrase) as stream:
+                        frames = [audio.frame async for audio in stream]
+                except Exception as e:
+                    logger.warning(f"could not pre-synthesize phrase {phrase!r}: {e}")
+                    continue
+                if not frames:
+                    # Registering it would play silence instead of synthesizing the phrase.
+                    logger.warning(f"no audio was synthesized for phrase {phrase!r}")
+                    continue
+                await asyncio.to_thread(self._cache.put, key, frames)
+                logger.info(f"cached audio for phrase {phrase!r}")
+            self._phrases[phrase] = key
+
+    def synthesize(self, text: str, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS) -> tts.ChunkedStream:
+        """
+        Returns the cached audio for text if there is any, otherwise synthesizes it with the wrapped TTS.
+        """
+        frames = self.cached_frames(text)
+        if frames is None:
+            return self._wrapped.synthesize(text, conn_options=conn_options)
+        return CachedChunkedStream(tts=self, input_text=text, frames=frames, conn_options=conn_options)
+
+    def stream(self, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS) -> tts.SynthesizeStream:
+        """
+        Returns a stream that plays leading cached phrases and forwards the rest to the wrapped TTS.
+        """
+        return CachedSynthesizeStream(tts=self, wrapped_tts=self._wrapped, conn_options=conn_options)
+
+    async def aclose(self) -> None:
+        await self._wrapped.aclose()
+
+
+class CachedChunkedStream(tts.ChunkedStream):
+    """
+    A ChunkedStream that replays frames from the phrase cache.
+    """
+    def __init__(
+        self, *, tts: CachedTTS, input_text: str, frames: List[rtc.AudioFrame], conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS
+    ) -> None:
+        super().__init__(tts=tts, input_text=input_text, conn_options=conn_options)
+        self._frames = frames
+
+    async def _run(self) -> None:
+        request_id = utils.shortuuid()
+        for frame in self._frames:
+            self._event_ch.send_nowait(tts.SynthesizedAudio(frame=frame, request_id=request_id))
+
+
+class CachedSynthesizeStream(tts.SynthesizeStream):
+    """
+    A SynthesizeStream that plays cached phrases found at the start of the input and
+    forwards the remaining text to a stream of the wrapped TTS.
+
+    Only leading phrases are served from the cache: once text has been forwarded, the wrapped TTS
+    may still be producing audio for it, so later phrases are forwarded too to keep the order intact.
+    """
+    def __init__(self, *, tts: CachedTTS, wrapped_tts: tts.TTS, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS) -> None:
+        super().__init__(tts=tts, conn_options=conn_options)
+        self._cached_tts = tts
+        self._wrapped_tts = wrapped_tts
+        self._cached_requests: Dict[str, str] = {}  # request id -> cached phrase played with it
+
+    async def _metrics_monitor_task(self, event_aiter) -> None:
+        """
+        Reports metrics for the cached phrases, the wrapped stream reports its own metrics for the rest.
+        Every event is read so the tee feeding this task doesn't buffer the whole reply.
+        """
+        audio_duration = 0.0
+        async for ev in event_aiter:
+            phrase = self._cached_requests.get(ev.request_id)
+            if phrase is None:
+                continue
+            audio_duration += ev.frame.duration
+            if ev.is_final:
+                self._tts.emit(
+                    "metrics_collected",
+                    TTSMetrics(
+                        timestamp=time.time(),
+                        request_id=ev.request_id,
+                        ttfb=0.0,  # cached frames are sent as soon as the phrase is pushed
+                        duration=0.0,
+                        characters_count=len(phrase),
+                        audio_duration=audio_duration,
+                        cancelled=False,
+                        label=self._tts.label,
+                        streamed=True,
+                        error=None,
+                    ),
+                )
+                audio_duration = 0.0
+
+    async def _run(self) -> None:
+        wrapped_stream: Optional[tts.SynthesizeStream] = None
+        forward_task: Optional[asyncio.Task] = None
+        pending = ""
+
+        async def _forward_audio(stream: tts.SynthesizeStream) -> None:
+            async for audio in stream:
+                self._event_ch.send_nowait(audio)
+
+        def _push(text: str) -> None:
+            nonlocal wrapped_stream, forward_task
+            if wrapped_stream is None:
+                wrapped_stream = self._wrapped_tts.stream(conn_options=self._conn_options)
+                forward_task = asyncio.create_task(_forward_audio(wrapped_stream))
+            wrapped_stream.push_text(text)
+
+        def _play_cached(phrase: str, frames: List[rtc.AudioFrame]) -> None:
+            request_id = utils.shortuuid()
+            self._cached_requests[request_id] = normalize_phrase(phrase)
+            for i, frame in enumerate(frames):
+                self._event_ch.send_nowait(
+                    tts.SynthesizedAudio(frame=frame, request_id=request_id, is_final=i == len(frames) - 1)
+                )
+
+        try:
+            async for data in self._input_ch:
+                if wrapped_stream is not None:
+                    if isinstance(data, self._FlushSentinel):
+                        wrapped_stream.flush()
+                    else:
+                        wrapped_stream.push_text(data)
+                    continue
+
+                if not isinstance(data, self._FlushSentinel):
+                    pending += data
+                    if not normalize_phrase(pending):
+                        continue
+                    frames = self._cached_tts.cached_frames(pending)
+                    if frames is not None:
+                        _play_cached(pending, frames)
+                        pending = ""
+                    elif not self._cached_tts.is_phrase_prefix(pending):
+                        _push(pending)
+                        pending = ""
+                    continue
+
+                # Flushing with a partial phrase buffered: it won't complete, send it to the wrapped TTS.
+                if normalize_phrase(pending):
+                    _push(pending)
+                    wrapped_stream.flush()
+                pending = ""
+
+            if normalize_phrase(pending):
+                _push(pending)
+            if wrapped_stream is not None:
+                wrapped_stream.end_input()
+                await forward_task
+        finally:
+            if forward_task is not None:
+                await utils.aio.gracefully_cancel(forward_task)
+            if wrapped_stream is not None:
+                await wrapped_stream.aclose()
+
+
+def _write_wav(file: Any, frames: List[rtc.AudioFrame]) -> None:
+    """
+    Writes 16-bit PCM frames to a WAV file, given as a path or a binary file object.
+    """
+    with wave.open(file, "wb") as wav:
+        wav.setnchannels(frames[0].num_channels)
+        wav.setsampwidth(2)
+        wav.setframerate(frames[0].sample_rate)
+        for frame in frames:
+            wav.writeframes(frame.data.tobytes())
+
+
+def _read_wav(path: str) -> List[rtc.AudioFrame]:
+    """
+    Reads a 16-bit PCM WAV file and splits it into FRAME_DURATION_MS frames.
+    """
+    with wave.open(path, "rb") as wav:
+        num_channels = wav.getnchannels()
+        sample_rate = wav.getframerate()
+        data = wav.readframes(wav.getnframes())
+
+    samples_per_frame = sample_rate * FRAME_DURATION_MS // 1000
+    bytes_per_frame = samples_per_frame * num_channels * 2
+    frames = []
+    for offset in range(0, len(data), bytes_per_frame):
+        chunk = data[offset:offset + bytes_per_frame]
+        frames.append(
+            rtc.AudioFrame(
+                data=chunk,
+                sample_rate=sample_rate,
+                num_channels=num_channels,
+                samples_per_channel=len(chunk) // (num_channels * 2),
+            )
+        )
+    return frames
@@ -0,0 +1,155 @@
+# startup_profile.py
+"""
+Startup profiling for the agent worker.
+
+Run from the repository root:
+
+    python -m _livekit.startup_profile
+
+It starts a fresh interpreter (so nothing is already imported), measures how long a job process takes
+to import the agent module, prewarm and build the graph runner, and lists the slowest imports.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+from typing import Dict, List, NamedTuple
+
+# Marks the line of the child output that holds the phase timings.
+_RESULT_PREFIX = "STARTUP_PROFILE "
+# Imports nested deeper than this are not reported. The profiled module is at depth 0,
+# so its direct imports (plugins, _livekit...) are at depth 1 and theirs at depth 2.
+MAX_IMPORT_DEPTH = 2
+
+
+class ImportTime(NamedTuple):
+    """
+    An entry of `python -X importtime`, times in microseconds.
+    """
+    name: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def _run_phases(module_name: str) -> None:
+    """
+    Runs the startup phases of a job process and prints their timings. Executed in the child interpreter.
+    """
+    timings: Dict[str, float] = {}
+    error = None
+    started = time.perf_counter()
+    try:
+        agent = importlib.import_module(module_name)
+        timings["import"] = time.perf_counter() - started
+
+        phase_started = time.perf_counter()
+        # Stand-in for the JobProcess given by LiveKit, prewarm only uses its userdata.
+        agent.prewarm(SimpleNamespace(userdata={}))
+        timings["prewarm"] = time.perf_counter() - phase_started
+
+        phase_started = time.perf_counter()
+        asyncio.run(agent.create_graph_runner())
+        timings["graph"] = time.perf_counter() - phase_started
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    timings["total"] = time.perf_counter() - started
+    print(_RESULT_PREFIX + json.dumps({"timings": timings, "error": error}), flush=True)
+
+
+def _parse_importtime(output: str, max_depth: int = MAX_IMPORT_DEPTH) -> List[ImportTime]:
+    """
+    Parses the output of `python -X importtime` into the imports nested up to max_depth.
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit() or not cumulative_us.strip().isdigit():
+            continue  # header line
+        # Each nesting level adds two spaces of indentation after the first one.
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        if depth <= max_depth:
+            imports.append(ImportTime(name.strip(), depth, int(self_us), int(cumulative_us)))
+    return imports
+
+
+def profile_startup(module_name: str = "agent", top: int = 15) -> Dict[str, object]:
+    """
+    Profiles the startup of a job process in a fresh interpreter.
+
+    Args:
+        module_name (str): The agent module to profile.
+        top (int): How many of the slowest imports to report.
+
+    Returns:
+        Dict[str, object]: The phase timings in seconds, the error if a phase failed, the slowest imports
+            nested up to MAX_IMPORT_DEPTH by cumulative time and the slowest imports of any depth by self time.
+    """
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [repo_root, os.environ.get("PYTHONPATH")])))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "_livekit.startup_profile", "--child", "--module", module_name],
+        cwd=repo_root,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    result = None
+    for line in proc.stdout.splitlines():
+        if line.startswith(_RESULT_PREFIX):
+            result = json.loads(line[len(_RESULT_PREFIX):])
+    if result is None:
+        raise RuntimeError(f"startup profiling failed:\n{proc.stderr[-2000:]}")
+
+    imports = _parse_importtime(proc.stderr, max_depth=sys.maxsize)
+    by_cumulative = sorted((i for i in imports if i.depth <= MAX_IMPORT_DEPTH), key=lambda i: i.cumulative_us, reverse=True)
+    by_self = sorted(imports, key=lambda i: i.self_us, reverse=True)
+    result["slowest_imports"] = [i._asdict() for i in by_cumulative[:top]]
+    result["slowest_imports_self"] = [i._asdict() for i in by_self[:top]]
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile the startup of an agent job process.")
+    parser.add_argument("--module", default="agent", help="The agent module to profile.")
+    parser.add_argument("--top", type=int, default=15, help="How many of the slowest imports to list.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _run_phases(args.module)
+        return
+
+    report = profile_startup(args.module, args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    timings = report["timings"]
+    print("Job process startup")
+    for phase, label in [("import", "import agent module"), ("prewarm", "prewarm"), ("graph", "build graph runner")]:
+        if phase in timings:
+            print(f"  {label:<24}{timings[phase] * 1000:>10.1f} ms")
+    print(f"  {'time to job readiness':<24}{timings['total'] * 1000:>10.1f} ms")
+    if report["error"]:
+        print(f"  stopped early: {report['error']}")
+    print(f"Slowest imports up to depth {MAX_IMPORT_DEPTH} (cumulative / self)")
+    for entry in report["slowest_imports"]:
+        name = "  " * entry["depth"] + entry["name"]
+        print(f"  {name:<48}{entry['cumulative_us'] / 1000:>10.1f} ms{entry['self_us'] / 1000:>10.1f} ms")
+    print("Slowest imports at any depth (self)")
+    for entry in report["slowest_imports_self"]:
+        print(f"  {entry['name']:<48}{entry['self_us'] / 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
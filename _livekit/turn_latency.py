@@ -0,0 +1,99 @@
+# turn_latency.py
+from __future__ import annotations
+import statistics
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from livekit.agents.pipeline import VoicePipelineAgent
+import logging
+
+if TYPE_CHECKING:
+    from _langgraph.graph_wrapper import LivekitGraphRunner, TurnTiming
+
+logger = logging.getLogger(__name__)
+
+
+class TurnLatencyTracker:
+    """
+    Measures the perceived time-to-first-audio of each turn: from the moment the user stops speaking
+    to the moment the agent starts speaking. Turns are split between tool turns and plain turns
+    using the timings recorded by the graph runner, so the effect of the progress fillers can be compared.
+
+    The latency is measured when the agent starts speaking, but the turn is only classified when the agent
+    stops speaking: the tools are called after the first chunks (e.g. an LLM preamble) are already spoken,
+    so the tool calls of the turn are only known once its graph run is over.
+
+    Args:
+        runner (LivekitGraphRunner): The runner used as the agent LLM.
+    """
+    def __init__(self, runner: LivekitGraphRunner) -> None:
+        """
+        Initializes the tracker.
+        """
+        self.runner = runner
+        self.samples: Dict[str, List[float]] = {"tool_turn": [], "plain_turn": []}
+        self._user_stopped_at: Optional[float] = None
+        # Latency and timings of the turn being spoken, classified when the agent stops speaking.
+        self._speaking_turn: Optional[Tuple[float, Optional[TurnTiming]]] = None
+
+    def attach(self, agent: VoicePipelineAgent) -> None:
+        """
+        Starts listening to the agent speech events.
+        """
+        agent.on("user_stopped_speaking", self._on_user_stopped_speaking)
+        agent.on("agent_started_speaking", self._on_agent_started_speaking)
+        agent.on("agent_stopped_speaking", self._on_agent_stopped_speaking)
+
+    def _on_user_stopped_speaking(self) -> None:
+        self._user_stopped_at = time.perf_counter()
+
+    def _on_agent_started_speaking(self) -> None:
+        # Speech that doesn't answer the user (e.g. the welcome message) isn't a turn.
+        if self._user_stopped_at is None:
+            return
+        latency = time.perf_counter() - self._user_stopped_at
+        self._user_stopped_at = None
+        self._record_turn()
+        # Keep the timings of this run, the runner moves on to a new one on the next user turn.
+        self._speaking_turn = (latency, self.runner.last_turn)
+
+    def _on_agent_stopped_speaking(self) -> None:
+        self._record_turn()
+
+    def _record_turn(self) -> None:
+        """
+        Classifies the turn being spoken, if any, and records its latency.
+        """
+        if self._speaking_turn is None:
+            return
+        latency, turn = self._speaking_turn
+        self._speaking_turn = None
+        kind = "tool_turn" if turn is not None and turn.tool_calls else "plain_turn"
+        self.samples[kind].append(latency)
+        logger.info(f"perceived time-to-first-audio {latency:.3f}s ({kind.replace('_', ' ')})")
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns count, mean, median and max of the perceived time-to-first-audio per kind of turn.
+        """
+        return {
+            kind: {
+                "count": len(values),
+                "mean": statistics.fmean(values),
+                "median": statistics.median(values),
+                "max": max(values),
+            }
+            for kind, values in self.samples.items()
+            if values
+        }
+
+    async def log_summary(self) -> None:
+        """
+        Logs the summary, meant to be used as a job shutdown callback.
+        """
+        # The job can end while the agent is still speaking.
+        self._record_turn()
+        for kind, stats in self.summary().items():
+            logger.info(
+                f"perceived time-to-first-audio, {kind.replace('_', ' ')}s: "
+                f"count {stats['count']}, mean {stats['mean']:.3f}s, median {stats['median']:.3f}s, max {stats['max']:.3f}s"
+            )
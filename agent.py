@@ -1,5 +1,9 @@
 # agent.py
+import asyncio
+import importlib
 import logging
+import os
+import time
 from dotenv import load_dotenv
 load_dotenv(dotenv_path=".env.local")
 
@@ -12,12 +16,85 @@ from livekit.agents import (
     metrics,
 )
 from livekit.agents.pipeline import VoicePipelineAgent
+# Plugins stay at module level: LiveKit requires them to be registered on the main thread of the worker process.
 from livekit.plugins import cartesia, deepgram, silero, turn_detector
-from _langgraph.graph_wrapper import LivekitGraphRunner  # our wrapper that adapts a compiled graph to LiveKit
-from _langgraph.graphs.tools_graph import get_compiled_graph
+from _langgraph.fillers import filler_phrases
+from _livekit.phrase_cache import PhraseAudioCache, CachedTTS, tts_namespace
+from _livekit.local_tts import LocalTTS
+from _livekit.load import LOAD_DIR_ENV, JobLoadReporter, WorkerLoad, default_load_dir
+from _livekit.turn_latency import TurnLatencyTracker
 
 logger = logging.getLogger("voice-agent")
 
+WELCOME_MESSAGE = "Hey, how can I help you today?"
+
+# The graph (and LangChain/LangGraph with it) is only imported by job processes, never by the worker process.
+GRAPH_MODULE = os.getenv("AGENT_GRAPH", "_langgraph.graphs.tools_graph")
+
+def load_graph_module():
+    """
+    Imports the graph module, which must define get_compiled_graph() and can define preload().
+
+    Returns:
+        module: The graph module.
+    """
+    return importlib.import_module(GRAPH_MODULE)
+
+
+def preload_graph() -> None:
+    """
+    Imports the graph module, its heavy dependencies and the graph wrapper, so that
+    create_graph_runner() only has to compile the graph once a job is assigned.
+    """
+    import _langgraph.graph_wrapper  # noqa: F401
+
+    graph_module = load_graph_module()
+    if hasattr(graph_module, "preload"):
+        graph_module.preload()
+
+
+async def create_graph_runner():
+    """
+    Compiles the graph and wraps it in a LivekitGraphRunner. The imports are already done by preload_graph() in prewarm.
+
+    Returns:
+        LivekitGraphRunner: The runner used as the agent LLM.
+    """
+    from _langgraph.graph_wrapper import LivekitGraphRunner  # our wrapper that adapts a compiled graph to LiveKit
+
+    # Get the compiled graph and create a LiveKitGraphRunner instance, this instance is the one responsible for running the graph.
+    # The LiveKitGraphRunner is a wrapper that adapts a compiled graph from LangGraph to be compliant with LiveKit's LLM interface.
+    compiled_graph, initial_state = await load_graph_module().get_compiled_graph()
+    return LivekitGraphRunner(compiled_graph, initial_state)
+
+
+def create_tts(phrase_cache: PhraseAudioCache) -> CachedTTS:
+    """
+    Creates the TTS, wrapped so that fixed utterances are replayed from the phrase cache.
+    Set AGENT_TTS=local to use a stand-in TTS that doesn't need a provider.
+
+    Args:
+        phrase_cache (PhraseAudioCache): The cache loaded in prewarm.
+
+    Returns:
+        CachedTTS: The TTS used by the agent.
+    """
+    if os.getenv("AGENT_TTS") == "local":
+        base_tts = LocalTTS()
+        namespace = tts_namespace(base_tts, sample_rate=base_tts.sample_rate, seconds_per_char=base_tts.seconds_per_char)
+    else:
+        # Only the options set in the environment are passed, the others keep the plugin defaults.
+        # The plugin version is part of the namespace so that new defaults don't replay old audio.
+        options = {
+            name: value
+            for name in ("model", "voice", "language")
+            if (value := os.getenv(f"CARTESIA_{name.upper()}"))
+        }
+        base_tts = cartesia.TTS(**options)
+        namespace = tts_namespace(base_tts, version=cartesia.__version__, **options)
+    return CachedTTS(tts=base_tts, cache=phrase_cache, namespace=namespace)
+
+
 def prewarm(proc: JobProcess):
     """
     Prewarm
@@ -29,8 +106,15 @@ def prewarm(proc: JobProcess):
         None
     
     This method prewarms the VAD model so that it doesn't have a delay when it's first used.
+    It also loads the phrase audio cached on disk so fixed utterances can be played without a TTS round-trip,
+    and imports the graph and its dependencies so idle job processes pay for them before a job is assigned.
     """
     proc.userdata["vad"] = silero.VAD.load()
+    preload_graph()
+    phrase_cache = PhraseAudioCache(cache_dir=os.getenv("PHRASE_CACHE_DIR", ".cache/phrases"))
+    loaded = phrase_cache.load_all()
+    logger.info(f"loaded {loaded} cached phrases")
+    proc.userdata["phrase_cache"] = phrase_cache
 
 
 async def entrypoint(ctx: JobContext):
@@ -49,24 +133,41 @@ async def entrypoint(ctx: JobContext):
     logger.info(f"connecting to room {ctx.room.name}")
     await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
 
+    # Fixed utterances (welcome message, graph fillers) are synthesized once and replayed from the cache.
+    # Warming runs while we wait for the participant; fillers aren't needed before the first tool call.
+    tts = create_tts(ctx.proc.userdata["phrase_cache"])
+    warm_welcome_task = asyncio.create_task(tts.warm([WELCOME_MESSAGE]))
+    warm_fillers_task = asyncio.create_task(tts.warm(filler_phrases()))
+    # The graph is compiled while we wait for the participant as well.
+    graph_runner_task = asyncio.create_task(create_graph_runner())
+
     participant = await ctx.wait_for_participant()
+    participant_joined = time.perf_counter()
     logger.info(f"starting voice assistant for participant {participant.identity}")
 
-    # Get the compiled graph and create a LiveKitGraphRunner instance, this instance is the one responsible for running the graph.
-    # The LiveKitGraphRunner is a wrapper that adapts a compiled graph from LangGraph to be compliant with LiveKit's LLM interface.
-    compiled_graph, initial_state = await get_compiled_graph()
-    graph_runner = LivekitGraphRunner(compiled_graph, initial_state)
-    
+    graph_runner = await graph_runner_task
+
+    # Publish the runner counters so the worker can report its load and shed optional work when saturated.
+    load_reporter = JobLoadReporter(WorkerLoad.from_env())
+    load_reporter.track(graph_runner)
+    load_reporter.start()
+    ctx.add_shutdown_callback(load_reporter.aclose)
+
     agent = VoicePipelineAgent(
         vad=ctx.proc.userdata["vad"],
         stt=deepgram.STT(),
         llm=graph_runner,  # using our wrapped LangGraph for inference
-        tts=cartesia.TTS(),
+        tts=tts,
         turn_detector=turn_detector.EOUModel(),
         min_endpointing_delay=0.5,
         max_endpointing_delay=5.0,
     )
 
+    # Measure how long the user waits for audio, tool turns (with progress fillers) apart from plain turns.
+    turn_latency = TurnLatencyTracker(graph_runner)
+    turn_latency.attach(agent)
+    ctx.add_shutdown_callback(turn_latency.log_summary)
+
     usage_collector = metrics.UsageCollector()
     @agent.on("metrics_collected")
     def on_metrics_collected(agent_metrics: metrics.AgentMetrics):
@@ -86,12 +187,21 @@ async def entrypoint(ctx: JobContext):
 
     # Start the agent and say the welcome message.
     agent.start(ctx.room, participant)
-    await agent.say("Hey, how can I help you today?", allow_interruptions=True)
+    await warm_welcome_task
+    logger.info(f"voice assistant ready {time.perf_counter() - participant_joined:.3f}s after the participant joined")
+    await agent.say(WELCOME_MESSAGE, allow_interruptions=True)
+    await warm_fillers_task
 
 if __name__ == "__main__":
+    # Job processes inherit this variable, so they publish their load where the worker reads it.
+    os.environ.setdefault(LOAD_DIR_ENV, default_load_dir())
+    worker_load = WorkerLoad.from_env()
     cli.run_app(
         WorkerOptions(
             entrypoint_fnc=entrypoint,
             prewarm_fnc=prewarm,
+            request_fnc=worker_load.request_fnc,
+            load_fnc=worker_load.load_fnc,
+            load_threshold=worker_load.threshold_option(),
         ),
     )
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import os
+import pickle
+import time
+from types import SimpleNamespace
+import pytest
+from _langgraph.graph_wrapper import GraphRunStats
+from _livekit.load import JobLoadReporter, LoadSnapshot, WorkerLoad
+
+
+class StubJobRequest:
+    """
+    Records whether a job was accepted or rejected.
+    """
+    def __init__(self, job_id: str) -> None:
+        self.id = job_id
+        self.result = None
+
+    async def accept(self) -> None:
+        self.result = "accepted"
+
+    async def reject(self) -> None:
+        self.result = "rejected"
+
+
+class StubRunner:
+    """
+    The part of LivekitGraphRunner the reporter uses. A class rather than a SimpleNamespace so it can be weakly referenced.
+    """
+    def __init__(self, active_streams: int = 0, pending_tool_calls: int = 0) -> None:
+        self.stats = GraphRunStats(active_streams=active_streams, pending_tool_calls=pending_tool_calls)
+        self.shed_optional_work = False
+
+
+def _snapshot(pid: int = 1, active_streams: int = 0, pending_tool_calls: int = 0, loop_lag: float = 0.0, age: float = 0.0):
+    return LoadSnapshot(
+        pid=pid,
+        active_streams=active_streams,
+        pending_tool_calls=pending_tool_calls,
+        loop_lag=loop_lag,
+        timestamp=time.time() - age,
+    )
+
+
+def _worker(*job_ids: str, devmode: bool = False):
+    return SimpleNamespace(
+        active_jobs=[SimpleNamespace(job=SimpleNamespace(id=job_id)) for job_id in job_ids],
+        _devmode=devmode,
+    )
+
+
+def _request_jobs(worker_load: WorkerLoad, count: int):
+    async def run():
+        requests = [StubJobRequest(f"job-{i}") for i in range(count)]
+        for req in requests:
+            await worker_load.request_fnc(req)
+        return [req.result for req in requests]
+
+    return asyncio.run(run())
+
+
+def test_compute_load_is_the_highest_ratio(tmp_path):
+    worker_load = WorkerLoad(max_jobs=4, max_active_streams=4, max_pending_tool_calls=8, max_loop_lag=0.2, directory=str(tmp_path))
+
+    assert worker_load.compute_load([]) == 0.0
+    assert worker_load.compute_load([], job_count=1) == 0.25
+    assert worker_load.compute_load([], job_count=1, cpu_load=0.5) == 0.5
+    # Job count defaults to the number of snapshots.
+    assert worker_load.compute_load([_snapshot(pid=1), _snapshot(pid=2)]) == 0.5
+    # Counters are summed across job processes, the loop lag is the worst one.
+    assert worker_load.compute_load([_snapshot(active_streams=1), _snapshot(active_streams=2)]) == 0.75
+    assert worker_load.compute_load([_snapshot(pending_tool_calls=3), _snapshot(pending_tool_calls=3)]) == 0.75
+    assert worker_load.compute_load([_snapshot(loop_lag=0.05), _snapshot(loop_lag=0.15)]) == pytest.approx(0.75)
+    assert worker_load.compute_load([_snapshot(loop_lag=2.0)]) == 1.0
+
+
+def test_from_env_coerces_limits(monkeypatch):
+    monkeypatch.setenv("WORKER_LOAD_MAX_JOBS", "4")
+    monkeypatch.setenv("WORKER_LOAD_MAX_LOOP_LAG", "0.5")
+    monkeypatch.setenv("WORKER_LOAD_DIRECTORY", "/ignored")
+
+    worker_load = WorkerLoad.from_env()
+
+    assert worker_load.max_jobs == 4 and isinstance(worker_load.max_jobs, int)
+    assert worker_load.max_loop_lag == 0.5 and isinstance(worker_load.max_loop_lag, float)
+    assert worker_load.max_active_streams == WorkerLoad.max_active_streams
+    assert worker_load.directory != "/ignored"
+
+
+def test_pickle_drops_runtime_state(tmp_path):
+    worker_load = WorkerLoad(max_jobs=3, directory=str(tmp_path))
+    worker_load._worker = _worker("job-1")
+    worker_load._accepted["job-2"] = time.time()
+
+    restored = pickle.loads(pickle.dumps(worker_load))
+
+    assert restored == worker_load
+    assert restored._worker is None
+    assert restored._accepted == {}
+    assert restored._job_count() == 0  # the lock is recreated
+
+
+def test_request_fnc_counts_accepted_jobs(tmp_path):
+    worker_load = WorkerLoad(max_jobs=2, load_threshold=1.0, directory=str(tmp_path))
+
+    assert _request_jobs(worker_load, 3) == ["accepted", "accepted", "rejected"]
+    # Once the worker runs an accepted job, it's counted once.
+    worker_load._worker = _worker("job-0")
+    assert worker_load._job_count() == 2
+
+
+def test_accepted_jobs_expire_after_grace(tmp_path):
+    worker_load = WorkerLoad(max_jobs=2, load_threshold=1.0, accept_grace=0.0, directory=str(tmp_path))
+
+    assert _request_jobs(worker_load, 3) == ["accepted", "accepted", "accepted"]
+    assert worker_load._job_count() == 0
+
+
+def test_request_fnc_accepts_every_job_in_dev_mode(tmp_path):
+    worker_load = WorkerLoad(max_jobs=1, load_threshold=0.5, directory=str(tmp_path))
+    worker_load._devmode = True
+
+    assert _request_jobs(worker_load, 3) == ["accepted", "accepted", "accepted"]
+
+
+def test_read_snapshots_removes_stale_ones(tmp_path):
+    worker_load = WorkerLoad(stale_after=5.0, directory=str(tmp_path))
+    for snapshot in (_snapshot(pid=1, active_streams=2), _snapshot(pid=2, age=60.0)):
+        with open(tmp_path / f"{snapshot.pid}.json", "w") as f:
+            json.dump(snapshot.__dict__, f)
+    (tmp_path / "3.json").write_text("{")  # being written
+
+    snapshots = worker_load.read_snapshots()
+
+    assert [s.pid for s in snapshots] == [1]
+    assert sorted(os.listdir(tmp_path)) == ["1.json", "3.json"]
+
+
+def test_reporter_publishes_runner_counters(tmp_path):
+    worker_load = WorkerLoad(max_active_streams=4, directory=str(tmp_path))
+    reporter = JobLoadReporter(worker_load)
+    runners = [StubRunner(active_streams=1, pending_tool_calls=1), StubRunner(active_streams=1)]
+    for runner in runners:
+        reporter.track(runner)
+
+    load = reporter._publish(reporter.snapshot())
+
+    assert load == 0.5
+    assert [(s.active_streams, s.pending_tool_calls) for s in worker_load.read_snapshots()] == [(2, 1)]
+    asyncio.run(reporter.aclose())
+    assert worker_load.read_snapshots() == []
@@ -0,0 +1,111 @@
+import asyncio
+from livekit.agents import tokenize
+from livekit.agents import tts as agents_tts
+from _livekit.local_tts import LocalTTS
+from _livekit.phrase_cache import CachedTTS, PhraseAudioCache, _read_wav, _write_wav, tts_namespace
+
+FILLER = "Let me look that up for you."
+
+
+def _cached_tts(cache_dir) -> CachedTTS:
+    """
+    A CachedTTS over the local stand-in TTS. LocalTTS doesn't stream, so it's wrapped in a StreamAdapter
+    like VoicePipelineAgent does.
+    """
+    local_tts = LocalTTS(latency=0, seconds_per_char=0.01)
+    adapter = agents_tts.StreamAdapter(tts=local_tts, sentence_tokenizer=tokenize.basic.SentenceTokenizer())
+    return CachedTTS(tts=adapter, cache=PhraseAudioCache(str(cache_dir)), namespace=tts_namespace(local_tts))
+
+
+async def _stream(cached_tts: CachedTTS, *pushes: str):
+    """
+    Pushes text (None flushes) to a CachedTTS stream and returns the synthesized frames.
+    """
+    stream = cached_tts.stream()
+    for text in pushes:
+        if text is None:
+            stream.flush()
+        else:
+            stream.push_text(text)
+    stream.end_input()
+    frames = [audio.frame async for audio in stream]
+    await stream.aclose()
+    return frames
+
+
+def test_wav_round_trip(tmp_path):
+    async def run():
+        async with LocalTTS(latency=0).synthesize("Hello there.") as stream:
+            return [audio.frame async for audio in stream]
+
+    frames = asyncio.run(run())
+    path = str(tmp_path / "phrase.wav")
+    _write_wav(path, frames)
+    loaded = _read_wav(path)
+
+    assert b"".join(f.data.tobytes() for f in loaded) == b"".join(f.data.tobytes() for f in frames)
+    assert loaded[0].sample_rate == frames[0].sample_rate
+    assert loaded[0].num_channels == frames[0].num_channels
+
+
+def test_synthesize_hit_and_miss(tmp_path):
+    async def run():
+        cached_tts = _cached_tts(tmp_path)
+        await cached_tts.warm([FILLER])
+        cached = cached_tts.cached_frames(FILLER)
+        async with cached_tts.synthesize(f"  {FILLER} ") as stream:
+            hit = [audio.frame async for audio in stream]
+        async with cached_tts.synthesize("Something else entirely.") as stream:
+            miss = [audio.frame async for audio in stream]
+        return cached, hit, miss
+
+    cached, hit, miss = asyncio.run(run())
+    assert cached and hit == cached
+    assert miss and not any(frame in cached for frame in miss)
+
+
+def test_warm_loads_from_disk(tmp_path):
+    async def run():
+        await _cached_tts(tmp_path).warm([FILLER])
+        # A new cache over the same directory, like another job process.
+        cache = PhraseAudioCache(str(tmp_path))
+        return cache.load_all()
+
+    assert asyncio.run(run()) == 1
+    assert not [name for name in tmp_path.iterdir() if name.suffix == ".tmp"]
+
+
+def test_stream_plays_leading_phrase_from_cache(tmp_path):
+    async def run():
+        cached_tts = _cached_tts(tmp_path)
+        await cached_tts.warm([FILLER])
+        frames = await _stream(cached_tts, "Let me look ", "that up for you. ", "The card is red.")
+        return cached_tts.cached_frames(FILLER), frames
+
+    cached, frames = asyncio.run(run())
+    assert frames[:len(cached)] == cached
+    assert len(frames) > len(cached)
+
+
+def test_stream_forwards_prefix_that_diverges(tmp_path):
+    async def run():
+        cached_tts = _cached_tts(tmp_path)
+        await cached_tts.warm([FILLER])
+        frames = await _stream(cached_tts, "Let me ", "think about it.")
+        return cached_tts.cached_frames(FILLER), frames
+
+    cached, frames = asyncio.run(run())
+    assert frames
+    assert not any(frame in cached for frame in frames)
+
+
+def test_stream_flush_with_partial_phrase(tmp_path):
+    async def run():
+        cached_tts = _cached_tts(tmp_path)
+        await cached_tts.warm([FILLER])
+        frames = await _stream(cached_tts, "Let me look", None, "Bolt is red.")
+        return cached_tts.cached_frames(FILLER), frames
+
+    cached, frames = asyncio.run(run())
+    assert frames
+    assert not any(frame in cached for frame in frames)
@@ -0,0 +1,145 @@
+import asyncio
+import json
+from typing import Any, List
+from langchain_core.globals import set_debug, set_llm_cache, set_verbose
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.tools import tool
+from langgraph.graph import StateGraph, START, END
+from langgraph.prebuilt import ToolNode
+from livekit.agents import llm
+from _langgraph.base_state import BaseState
+from _langgraph.fillers import DEFAULT_FILLER
+from _langgraph.graph_factory import LangGraphFactory
+from _langgraph.graph_wrapper import LivekitGraphRunner
+from _langgraph.graphs.tools_graph import route_tools
+from _langgraph.nodes.llm_node import LLMNode
+from _langgraph.nodes.tool_progress import tool_progress_node
+
+# The repository's langchain/ folder shadows the langchain package, and langchain_core reads its
+# globals from whatever `import langchain` finds. Setting them once gives the folder those attributes.
+set_verbose(False)
+set_debug(False)
+set_llm_cache(None)
+
+ANSWER = "Black Lotus costs zero mana."
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    A chat model that streams scripted responses, one per call.
+    """
+    responses: List[AIMessage]
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=self.responses.pop(0))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        response = self.responses.pop(0)
+        for i, word in enumerate(response.content.split(" ") if response.content else []):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=(" " if i else "") + word))
+        for i, tool_call in enumerate(response.tool_calls):
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {"name": tool_call["name"], "args": json.dumps(tool_call["args"]), "id": tool_call["id"], "index": i}
+                    ],
+                )
+            )
+
+
+@tool
+async def card_lookup(name: str) -> str:
+    """Looks up a card."""
+    await asyncio.sleep(0.05)
+    return f"{name}: 0 mana artifact"
+
+
+async def _tool_graph(model: BaseChatModel):
+    """
+    The tools graph of _langgraph.graphs.tools_graph, with a scripted model and tool.
+    """
+    async def build(graph: StateGraph) -> None:
+        llm_node = LLMNode(name="llm_node", description="Scripted LLM.", model=model, tools=[card_lookup])
+        graph.add_node("llm_node", llm_node.run)
+        graph.add_node("tool_progress_node", tool_progress_node)
+        graph.add_node("tool_node", ToolNode(tools=[card_lookup]).ainvoke)
+        graph.add_edge(START, "llm_node")
+        graph.add_conditional_edges("llm_node", route_tools, ["tool_progress_node", END])
+        graph.add_edge("tool_progress_node", "tool_node")
+        graph.add_edge("tool_node", "llm_node")
+
+    return await LangGraphFactory(BaseState).create_graph(build)
+
+
+async def _run_turn(runner: LivekitGraphRunner, text: str) -> List[str]:
+    """
+    Streams a user turn through the runner and returns the text of its chunks.
+    """
+    chat_ctx = llm.ChatContext().append(role="user", text=text)
+    stream = runner.chat(chat_ctx=chat_ctx)
+    contents = [chunk.choices[0].delta.content async for chunk in stream]
+    await stream.aclose()
+    return contents
+
+
+def test_tool_turn_streams_filler_before_the_tool_runs():
+    model = ScriptedChatModel(
+        responses=[
+            AIMessage(content="", tool_calls=[{"name": "card_lookup", "args": {"name": "Black Lotus"}, "id": "call_1"}]),
+            AIMessage(content=ANSWER),
+        ]
+    )
+
+    async def run():
+        graph = await _tool_graph(model)
+        runner = LivekitGraphRunner(graph, {})
+        contents = await _run_turn(runner, "How much is Black Lotus?")
+        state = await graph.aget_state({"configurable": {"thread_id": "1"}})
+        return runner, contents, state.values["messages"]
+
+    runner, contents, messages = asyncio.run(run())
+
+    # The filler goes out first and only once, the "messages" mode doesn't send it again.
+    assert contents[0] == DEFAULT_FILLER + " "
+    assert "".join(contents).count(DEFAULT_FILLER) == 1
+    assert "".join(contents[1:]) == ANSWER
+
+    # The checkpoint holds the filler as the content of the tool-calling message, right before its result.
+    tool_call_message, tool_message = messages[1], messages[2]
+    assert isinstance(tool_call_message, AIMessage)
+    assert tool_call_message.content == DEFAULT_FILLER
+    assert tool_call_message.tool_calls[0]["id"] == "call_1"
+    assert isinstance(tool_message, ToolMessage) and tool_message.tool_call_id == "call_1"
+    assert messages[-1].content == ANSWER
+
+    timing = runner.last_turn
+    assert timing.tool_calls == 1
+    assert timing.first_chunk == timing.first_progress
+    assert timing.first_progress < timing.first_answer
+    assert runner.stats.active_streams == 0
+    assert runner.stats.pending_tool_calls == 0
+
+
+def test_plain_turn_has_no_filler():
+    model = ScriptedChatModel(responses=[AIMessage(content=ANSWER)])
+
+    async def run():
+        runner = LivekitGraphRunner(await _tool_graph(model), {})
+        return runner, await _run_turn(runner, "Hello!")
+
+    runner, contents = asyncio.run(run())
+
+    assert "".join(contents) == ANSWER
+    assert runner.last_turn.tool_calls == 0
+    assert runner.last_turn.first_progress is None
+    assert runner.last_turn.first_answer is None
@@ -0,0 +1,61 @@
+import asyncio
+from types import SimpleNamespace
+from livekit.agents.utils import EventEmitter
+from _langgraph.graph_wrapper import TurnTiming
+from _livekit.turn_latency import TurnLatencyTracker
+
+
+def _tracker():
+    runner = SimpleNamespace(last_turn=None)
+    agent = EventEmitter()
+    tracker = TurnLatencyTracker(runner)
+    tracker.attach(agent)
+    return tracker, runner, agent
+
+
+def _start_turn(runner, agent) -> TurnTiming:
+    """
+    The user stops speaking, the runner starts a graph run and the agent starts speaking.
+    """
+    agent.emit("user_stopped_speaking")
+    runner.last_turn = TurnTiming(started=0.0)
+    agent.emit("agent_started_speaking")
+    return runner.last_turn
+
+
+def test_speech_without_user_turn_is_ignored():
+    tracker, _, agent = _tracker()
+
+    agent.emit("agent_started_speaking")  # welcome message
+    agent.emit("agent_stopped_speaking")
+
+    assert tracker.samples == {"tool_turn": [], "plain_turn": []}
+
+
+def test_turns_are_classified_when_the_agent_stops_speaking():
+    tracker, runner, agent = _tracker()
+
+    _start_turn(runner, agent)
+    agent.emit("agent_stopped_speaking")
+
+    # The LLM speaks a preamble, then calls a tool while the agent is already speaking.
+    timing = _start_turn(runner, agent)
+    assert len(tracker.samples["plain_turn"]) == 1 and not tracker.samples["tool_turn"]
+    timing.tool_calls = 1
+    # The next user turn starts a new run before the agent is done, the spoken turn keeps its own timings.
+    runner.last_turn = TurnTiming(started=0.0)
+    agent.emit("agent_stopped_speaking")
+
+    assert len(tracker.samples["plain_turn"]) == 1
+    assert len(tracker.samples["tool_turn"]) == 1
+    assert all(latency >= 0 for latency in tracker.samples["tool_turn"] + tracker.samples["plain_turn"])
+
+
+def test_turn_still_speaking_is_recorded_at_shutdown():
+    tracker, runner, agent = _tracker()
+
+    _start_turn(runner, agent).tool_calls = 2
+    asyncio.run(tracker.log_summary())
+
+    assert len(tracker.samples["tool_turn"]) == 1
+    assert tracker.summary()["tool_turn"]["count"] == 1